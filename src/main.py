@@ -1,6 +1,6 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import importlib, os, json, sys, time, subprocess
+import atexit, importlib, os, json, sys, time, subprocess
 from pathlib import Path
 from typing import Optional, List, Any
 
@@ -15,13 +15,20 @@ def _load_local_module(name: str):
 _scriptgen = _load_local_module("src.scriptgen") or _load_local_module("scriptgen")
 _tts       = _load_local_module("src.tts")       or _load_local_module("tts")
 _video     = _load_local_module("src.video")     or _load_local_module("video")
-_uploader  = _load_local_module("src.youtube_upload") or _load_local_module("youtube_upload")
 
 generate_script       = getattr(_scriptgen, "generate_script", None)
 build_titles          = getattr(_scriptgen, "build_titles", None)
 synth_tts_to_mp3      = getattr(_tts, "synth_tts_to_mp3", None)
 make_slideshow_video  = getattr(_video, "make_slideshow_video", None)
-try_upload_youtube    = getattr(_uploader, "upload_video", None) or getattr(_uploader, "try_upload_youtube", None)
+
+def try_upload_youtube(**kwargs: Any) -> Optional[str]:
+    # googleapiclient/google-auth içe aktarımı ağırdır; yalnızca yükleme gerçekten yapılacaksa yüklenir.
+    uploader = _load_local_module("src.youtube_upload") or _load_local_module("youtube_upload")
+    # upload_video hata fırlatır; main() bunu yakalayıp out/error.log'a [upload warning] yazar.
+    fn = getattr(uploader, "upload_video", None) or getattr(uploader, "try_upload_youtube", None)
+    if fn is None:
+        raise RuntimeError("youtube_upload modülü yüklenemedi")
+    return fn(**kwargs)
 
 def _env(name: str, default: Optional[str] = None) -> Optional[str]:
     v = os.getenv(name)
@@ -34,17 +41,36 @@ def _env_bool(name: str, default: bool=False) -> bool:
 def _ts(fmt: str = "%Y%m%d-%H%M%S") -> str:
     return time.strftime(fmt, time.gmtime())
 
+_ERROR_FH = None
+
 def _append_error(msg: str) -> None:
-    Path("out").mkdir(parents=True, exist_ok=True)
-    with open("out/error.log", "a", encoding="utf-8") as f:
-        f.write(msg.rstrip() + "\n")
+    # Dosya ilk uyarıda bir kez açılır (satır tamponlu); süreç sonunda atexit kapatır.
+    global _ERROR_FH
+    if _ERROR_FH is None:
+        Path("out").mkdir(parents=True, exist_ok=True)
+        _ERROR_FH = open("out/error.log", "a", encoding="utf-8", buffering=1)
+        atexit.register(_ERROR_FH.close)
+    _ERROR_FH.write(msg.rstrip() + "\n")
 
 def _ffmpeg_silence_mp3(out_mp3: str, seconds: int = 45) -> None:
     cmd = [
-        "ffmpeg","-y","-f","lavfi","-i","anullsrc=r=44100:cl=mono",
+        "ffmpeg","-y","-hide_banner","-loglevel","error","-nostdin",
+        "-f","lavfi","-i","anullsrc=r=44100:cl=mono",
         "-t", str(seconds), "-acodec","libmp3lame","-q:a","9", out_mp3
     ]
-    subprocess.run(cmd, check=True)
+    subprocess.run(cmd, check=True, stdin=subprocess.DEVNULL)
+
+def _fallback_black_video(mp3_path: str, mp4_path: str) -> None:
+    # last-chance: düz siyah arka plan + ses. Asıl render (donanım kodlayıcı dahil) az önce
+    # başarısız oldu; burada bilinen-çalışır libx264, sabit kare için en hızlı ayarla.
+    subprocess.run([
+        "ffmpeg","-y","-hide_banner","-loglevel","error","-nostdin",
+        "-f","lavfi","-i","color=c=black:s=1080x1920:d=9999",
+        "-i", mp3_path,
+        "-c:v","libx264","-preset","ultrafast","-tune","stillimage","-pix_fmt","yuv420p",
+        "-shortest","-movflags","+faststart",
+        mp4_path
+    ], check=True, stdin=subprocess.DEVNULL)
 
 def main() -> None:
     Path("out").mkdir(parents=True, exist_ok=True)
@@ -142,15 +168,7 @@ def main() -> None:
         )
     except Exception as e:
         _append_error(f"[render warning] {e}")
-        # last-chance: düz siyah arka plan + ses
-        subprocess.run([
-            "ffmpeg","-y",
-            "-f","lavfi","-i","color=c=black:s=1080x1920:d=9999",
-            "-i", mp3_path,
-            "-c:v","libx264","-pix_fmt","yuv420p",
-            "-shortest","-movflags","+faststart",
-            mp4_path
-        ], check=True)
+        _fallback_black_video(mp3_path, mp4_path)
 
     print(f">> Done: {mp4_path}", flush=True)
 
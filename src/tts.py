@@ -100,14 +100,14 @@ def _mk_silence_mp3(seconds: float) -> str:
     tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
     tmp.close()
     cmd = [
-        "ffmpeg", "-y",
+        "ffmpeg", "-y", "-hide_banner", "-loglevel", "error", "-nostdin",
         "-f", "lavfi", "-i", "anullsrc=r=24000:cl=mono",
         "-t", f"{seconds:.3f}",
         "-q:a", "9",
         "-acodec", "libmp3lame",
         tmp.name,
     ]
-    subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    subprocess.run(cmd, check=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
     return tmp.name
 
 def _chain_atempo(val: float) -> str:
@@ -216,7 +216,7 @@ def synth_tts_to_mp3(
                 f.write(f"file '{item.as_posix()}'\n")
 
         cmd = [
-            "ffmpeg", "-y",
+            "ffmpeg", "-y", "-hide_banner", "-loglevel", "error", "-nostdin",
             "-f", "concat", "-safe", "0",
             "-i", concat_list.as_posix(),
             "-vn",
@@ -234,7 +234,7 @@ def synth_tts_to_mp3(
             out_mp3,
         ])
 
-        subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        subprocess.run(cmd, check=True, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
 
     if silence_mp3:
         try:
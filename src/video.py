@@ -1,11 +1,17 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import os, random, time, tempfile, subprocess, re, socket
+import os, random, time, tempfile, subprocess, re, socket, types, shutil
 from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Iterable, Optional
+from typing import Callable, List, Tuple, Iterable, Optional
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
 import urllib.request
+try:
+    import numpy as np  # type: ignore
+    _HAS_NUMPY = True
+except Exception:
+    _HAS_NUMPY = False
 
 W, H = 1080, 1920
 FONT_BOLD = "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"
@@ -23,6 +29,27 @@ USE_UNSPLASH = _env("USE_UNSPLASH", "0").lower() in ("1","true","yes")
 
 socket.setdefaulttimeout(NET_TIMEOUT)
 
+def _truthy(name: str, default: str) -> bool:
+    return _env(name, default).lower() in ("1","true","yes")
+
+def _load_cfg() -> types.SimpleNamespace:
+    # Kare başına os.getenv yerine render ayarları bir kez okunur.
+    return types.SimpleNamespace(
+        fps=int(_env("FPS","60")),
+        bgs_per_slide=max(1, min(10, int(_env("BG_IMAGES_PER_SLIDE","4")))),
+        zoom_per_sec=float(_env("BG_ZOOM_PER_SEC","0.0018")),
+        # 0.6 px blur gözle neredeyse fark edilmiyor (zoompan zaten yumuşatıyor); isteğe bağlı.
+        bg_blur=_truthy("BG_BLUR","0"),
+        ticker_h=int(_env("TICKER_H","120")),
+        breaking=_env("BREAKING_TEXT","BREAKING NEWS") if _truthy("BREAKING_ON","0") else None,
+        presenter_size=int(_env("PRESENTER_SIZE","260")),
+        presenter_pos=_env("PRESENTER_POS","top-right"),
+        single_pass=_truthy("SINGLE_PASS_ENCODE","1"),
+        bitrate=_env("TTS_BITRATE","128k"),
+    )
+
+_CFG = _load_cfg()
+
 def _ffprobe_duration(path: str) -> float:
     try:
         out = subprocess.run(
@@ -43,6 +70,14 @@ def _theme_colors(theme: str) -> Tuple[Tuple[int,int,int], Tuple[int,int,int], T
         return (8,14,30), (20,90,180), (0,140,255)
     return (18,18,28), (120,0,0), (220,40,40)
 
+@lru_cache(maxsize=1)
+def _spot_mask() -> Image.Image:
+    # Geometri sabit; büyük yarıçaplı blur yalnızca bir kez hesaplanır.
+    mask = Image.new("L", (W,H), 0)
+    mdr  = ImageDraw.Draw(mask)
+    mdr.ellipse([(-W*0.1,-H*0.2),(W*1.1,H*0.8)], fill=180)
+    return mask.filter(ImageFilter.GaussianBlur(180))
+
 def _fallback_bg(theme: str, variant: int = 0) -> Image.Image:
     c1, c2, c3 = _theme_colors(theme)
     jitter = (variant % 5) * 8
@@ -61,16 +96,19 @@ def _fallback_bg(theme: str, variant: int = 0) -> Image.Image:
         )
         drw.line([(0,y),(W,y)], fill=col)
     spot = Image.new("RGB", (W,H), c3)
-    mask = Image.new("L", (W,H), 0)
-    mdr  = ImageDraw.Draw(mask)
-    mdr.ellipse([(-W*0.1,-H*0.2),(W*1.1,H*0.8)], fill=180)
-    mask = mask.filter(ImageFilter.GaussianBlur(180))
-    img  = Image.composite(spot, img, mask)
-    px = img.load()
-    for _ in range(8000):
-        x = random.randint(0, W-1); y = random.randint(0, H-1)
-        r,g,b = px[x,y]; dd = random.randint(-10,10)
-        px[x,y] = (max(0,min(255,r+dd)), max(0,min(255,g+dd)), max(0,min(255,b+dd)))
+    img  = Image.composite(spot, img, _spot_mask())
+    # Nokta/sapma değerleri random'dan: random.seed ile tekrarlanabilir. numpy (opsiyonel) yalnızca uygular.
+    pts = [(random.randint(0, W-1), random.randint(0, H-1), random.randint(-10, 10)) for _ in range(8000)]
+    if _HAS_NUMPY:
+        xs, ys, dd = np.array(pts).T
+        arr = np.array(img)
+        arr[ys, xs] = np.clip(arr[ys, xs].astype(np.int16) + dd[:, None], 0, 255).astype(np.uint8)
+        img = Image.fromarray(arr)
+    else:
+        px = img.load()
+        for x, y, dd in pts:
+            r,g,b = px[x,y]
+            px[x,y] = (max(0,min(255,r+dd)), max(0,min(255,g+dd)), max(0,min(255,b+dd)))
     return img.filter(ImageFilter.GaussianBlur(1.0))
 
 # --------------- Görseller (picsum/unsplash) ---------------
@@ -188,76 +226,109 @@ def _fit_cover(img: Image.Image, w=W, h=H) -> Image.Image:
     iw, ih = img.size
     if iw == 0 or ih == 0:
         return img.resize((w,h))
-    scale = max(w/iw, h/ih)
-    nw, nh = int(iw*scale), int(ih*scale)
-    img2 = img.resize((nw, nh), Image.LANCZOS)
-    x = (nw - w)//2
-    y = (nh - h)//2
-    return img2.crop((x, y, x+w, y+h))
+    # Önce kaynaktan hedef en-boy oranındaki orta bölgeyi seç, sonra tek seferde ölçekle;
+    # büyütülmüş ara görüntü oluşturup kırpmaya gerek kalmaz.
+    target = w / h
+    if iw / ih > target:
+        cw = ih * target
+        box = ((iw - cw) / 2, 0, (iw + cw) / 2, ih)
+    else:
+        ch = iw / target
+        box = (0, (ih - ch) / 2, iw, (ih + ch) / 2)
+    return img.resize((w, h), Image.LANCZOS, box=box)
 
 # --------------- Metin yardımcıları ---------------
-def _wrap_lines(drw: ImageDraw.ImageDraw, text: str, font: ImageFont.FreeTypeFont, max_w: int) -> list[str]:
+@lru_cache(maxsize=16)
+def _font(path: str, size: int) -> ImageFont.ImageFont:
+    # TTF dosyası her çağrıda yeniden açılıp ayrıştırılmasın; font nesneleri salt okunur, paylaşılabilir.
+    try:
+        return ImageFont.truetype(path, size)
+    except Exception:
+        return ImageFont.load_default()
+
+def _wrap_lines(
+    drw: ImageDraw.ImageDraw,
+    text: str,
+    font: ImageFont.FreeTypeFont,
+    max_w: int,
+    stroke_width: int = 2,
+    max_lines: int | None = None,
+) -> list[str]:
     words = (text or "").split()
     if not words: return [""]
     lines, cur = [], ""
     for w in words:
         t = w if not cur else f"{cur} {w}"
-        bbox = drw.textbbox((0,0), t, font=font, stroke_width=2)
+        bbox = drw.textbbox((0,0), t, font=font, stroke_width=stroke_width)
         if (bbox[2]-bbox[0]) <= max_w:
             cur = t
         else:
             if cur: lines.append(cur)
             cur = w
+            # Yeterli satır doldu; kalan kelimeleri ölçmeye gerek yok.
+            if max_lines is not None and len(lines) >= max_lines:
+                return lines[:max_lines]
     if cur: lines.append(cur)
-    return lines
+    return lines[:max_lines] if max_lines is not None else lines
 
 # --------------- Spiker avatar ---------------
+@lru_cache(maxsize=8)
+def _avatar_shadow(size: int) -> Image.Image:
+    shadow = Image.new("RGBA", (size+20,size+20), (0,0,0,0))
+    sd = ImageDraw.Draw(shadow)
+    sd.ellipse((10,10,size+10,size+10), fill=(0,0,0,140))
+    return shadow.filter(ImageFilter.GaussianBlur(8))
+
 def _load_presenter_avatar(size: int) -> Image.Image | None:
-    url = _env("PRESENTER_URL", "")
+    return _cached_avatar(_env("PRESENTER_URL", ""), _env("PRESENTER_INITIALS","AI"), size)
+
+@lru_cache(maxsize=8)
+def _cached_avatar(url: str, initials: str, size: int) -> Image.Image | None:
+    # Aynı çalışma içinde avatar bir kez indirilip hazırlanır; sonuç salt okunur paylaşılır.
+    downloaded = False
+    p = None
     try:
         if url.startswith("http"):
             p = _download_url(url)
+            downloaded = p is not None
         elif url and os.path.exists(url):
             p = url
-        else:
-            p = None
         if not p:
             avatar = Image.new("RGBA", (size, size), (30,30,30,255))
             m = Image.new("L", (size, size), 0)
             ImageDraw.Draw(m).ellipse((0,0,size-1,size-1), fill=255)
             avatar.putalpha(m)
             dr = ImageDraw.Draw(avatar)
-            try:
-                fnt = ImageFont.truetype(FONT_BOLD, size//2)
-            except Exception:
-                fnt = ImageFont.load_default()
-            txt = _env("PRESENTER_INITIALS","AI")
-            bb = dr.textbbox((0,0), txt, font=fnt)
+            fnt = _font(FONT_BOLD, size//2)
+            bb = dr.textbbox((0,0), initials, font=fnt)
             dr.text(((size-(bb[2]-bb[0]))//2, (size-(bb[3]-bb[1]))//2),
-                    txt, font=fnt, fill=(255,255,255,255))
+                    initials, font=fnt, fill=(255,255,255,255))
             return avatar
-        img = Image.open(p).convert("RGBA").resize((size,size), Image.LANCZOS)
+        with Image.open(p) as raw:
+            img = raw.convert("RGBA").resize((size,size), Image.LANCZOS)
         mask = Image.new("L", (size,size), 0)
         ImageDraw.Draw(mask).ellipse((0,0,size-1,size-1), fill=255)
-        shadow = Image.new("RGBA", (size+20,size+20), (0,0,0,0))
-        sd = ImageDraw.Draw(shadow)
-        sd.ellipse((10,10,size+10,size+10), fill=(0,0,0,140))
-        shadow = shadow.filter(ImageFilter.GaussianBlur(8))
         base = Image.new("RGBA", (size+20,size+20), (0,0,0,0))
-        base.alpha_composite(shadow,(0,0))
+        base.alpha_composite(_avatar_shadow(size),(0,0))
         circle = Image.new("RGBA", (size,size), (0,0,0,0))
         circle.paste(img, (0,0), mask)
         base.alpha_composite(circle, (10,10))
         return base
     except Exception:
         return None
+    finally:
+        if downloaded and p:
+            try:
+                os.remove(p)
+            except OSError:
+                pass
 
 def _place_presenter(canvas: Image.Image, avatar: Image.Image, pos: str):
     if avatar is None:
         return
     aw, ah = avatar.size
     m = 40
-    ticker_h = int(_env("TICKER_H","120"))
+    ticker_h = _CFG.ticker_h
     if pos == "bottom-left":
         xy = (m, H - ticker_h - ah - m)
     elif pos == "bottom-right":
@@ -266,107 +337,197 @@ def _place_presenter(canvas: Image.Image, avatar: Image.Image, pos: str):
         xy = (W - aw - m, 220)
     else:
         xy = (m, 220)
-    canvas.alpha_composite(avatar, xy)
+    # Yalnızca avatar bölgesi harmanlanır; tuval RGB de olabilir.
+    canvas.paste(avatar, xy, avatar)
 
 # --------------- Kompozit: caption + banner + spiker ---------------
-def _compose_caption(
-    bg: Image.Image,
-    caption: str,
-    theme: str,
-    blink_variant: int=0,
-    avatar: Image.Image | None = None,
-) -> Image.Image:
-    img = bg.convert("RGBA")
-
-    topbar_h = 160
-    topbar = Image.new("RGBA", (W, topbar_h), (0,0,0, int(0.35*255)))
-    img.alpha_composite(topbar, (0,60))
-
-    ticker_h = int(_env("TICKER_H","120"))
-    bottombar = Image.new("RGBA", (W, ticker_h), (0,0,0, int(0.55*255)))
-    img.alpha_composite(bottombar, (0, H - ticker_h))
+@lru_cache(maxsize=8)
+def _shade_lut(alpha: float, mode: str) -> list[int]:
+    # Siyah, sabit alfalı şerit = renk kanallarını (1-a) ile çarpmak; alfa kanalı aynen kalır.
+    keep = 1.0 - int(alpha*255) / 255.0
+    shade = [int(round(v*keep)) for v in range(256)]
+    identity = list(range(256))
+    return shade * 3 + (identity if mode == "RGBA" else [])
+
+def _shade_band(img: Image.Image, y0: int, y1: int, alpha: float) -> None:
+    box = (0, max(0, y0), W, min(H, y1))
+    img.paste(img.crop(box).point(_shade_lut(alpha, img.mode)), box)
+
+@lru_cache(maxsize=4)
+def _breaking_box(w: int, h: int, alpha: int) -> Image.Image:
+    # Kutu yalnızca iki yanıp sönme fazında değişir; her altyazıda yeniden üretmeye gerek yok.
+    return Image.new("RGBA", (w, h), (255,49,49, alpha)).filter(ImageFilter.GaussianBlur(0.5))
+
+def _caption_overlay(caption: str, breaking: str | None, blink_phase: int) -> Image.Image:
+    """
+    Başlık metni + BREAKING kutusu için tam kare saydam katman. Önbelleğe alınmaz:
+    tek çağıran _caption_patch kırpılmış sonucu saklar (tam kare RGBA ~8 MB).
+    """
+    overlay = Image.new("RGBA", (W, H), (0,0,0,0))
 
-    if _env("BREAKING_ON","0").lower() in ("1","true","yes"):
-        text = _env("BREAKING_TEXT","BREAKING NEWS")
-        try:
-            bf = ImageFont.truetype(FONT_BOLD, 42)
-        except Exception:
-            bf = ImageFont.load_default()
-        draw = ImageDraw.Draw(img)
-        bb = draw.textbbox((0,0), text, font=bf)
+    if breaking:
+        bf = _font(FONT_BOLD, 42)
+        draw = ImageDraw.Draw(overlay)
+        bb = draw.textbbox((0,0), breaking, font=bf)
         tw, th = bb[2]-bb[0], bb[3]-bb[1]
         padx, pady = 28, 16
-        alpha = 220 if (blink_variant % 2 == 0) else 180
-        box = Image.new("RGBA", (tw+padx*2, th+pady*2), (255,49,49, alpha))
-        box = box.filter(ImageFilter.GaussianBlur(0.5))
-        img.alpha_composite(box, (40, 30))
-        draw.text((40+padx, 30+pady), text, font=bf, fill=(255,255,255,255))
+        alpha = 220 if blink_phase == 0 else 180
+        overlay.alpha_composite(_breaking_box(tw+padx*2, th+pady*2, alpha), (40, 30))
+        draw.text((40+padx, 30+pady), breaking, font=bf, fill=(255,255,255,255))
 
-    try:
-        title_font = ImageFont.truetype(FONT_BOLD, 50)
-    except Exception:
-        title_font = ImageFont.load_default()
-    draw = ImageDraw.Draw(img)
-
-    def _wrap(drw, text, font, max_w):
-        words = (text or "").split()
-        if not words: return [""]
-        lines, cur = [], ""
-        for w in words:
-            t = w if not cur else f"{cur} {w}"
-            bbox = drw.textbbox((0,0), t, font=font, stroke_width=3)
-            if (bbox[2]-bbox[0]) <= max_w:
-                cur = t
-            else:
-                if cur: lines.append(cur)
-                cur = w
-        if cur: lines.append(cur)
-        return lines[:3]
-
-    lines = _wrap(draw, caption or "", title_font, W-120)
+    title_font = _font(FONT_BOLD, 50)
+    draw = ImageDraw.Draw(overlay)
+
+    lines = _wrap_lines(draw, caption, title_font, W-120, stroke_width=3, max_lines=3)
     y = 90
     for line in lines:
         bb = draw.textbbox((0,0), line, font=title_font, stroke_width=3)
         tw, th = bb[2]-bb[0], bb[3]-bb[1]
         x = (W - tw)//2
+        # Saydam katmanda kontur opak olmalı; doğrudan kareye çizimdeki görünümle aynı sonuç.
         draw.text((x, y), line, font=title_font, fill=(255,255,255,255),
-                  stroke_width=3, stroke_fill=(0,0,0,190))
+                  stroke_width=3, stroke_fill=(0,0,0,255))
         y += th + 10
 
-    size = int(_env("PRESENTER_SIZE","260"))
-    pos  = _env("PRESENTER_POS","top-right")
-    presenter = avatar if avatar is not None else _load_presenter_avatar(size)
+    return overlay
+
+@lru_cache(maxsize=64)
+def _caption_patch(caption: str, breaking: str | None, blink_phase: int) -> tuple[Image.Image, tuple[int, int]]:
+    # Aynı altyazı slaytın tüm arka planlarında kullanılır; metin ölçümü/çizimi altyazı başına bir kez.
+    # Tam kare yerine yalnızca dolu bölge (bbox) yapıştırılır; maske olarak katmanın kendi alfası kullanılır.
+    overlay = _caption_overlay(caption, breaking, blink_phase)
+    bbox = overlay.getbbox() or (0, 0, 1, 1)
+    return overlay.crop(bbox), (bbox[0], bbox[1])
+
+def _compose_caption(
+    bg: Image.Image,
+    caption: str,
+    theme: str,
+    blink_variant: int=0,
+    avatar: Image.Image | None = None,
+) -> Image.Image:
+    # Kare RGB kalır: RGBA'ya çevirip geri dönmek iki tam kare kopyası demek.
+    img = bg.copy() if bg.mode == "RGB" else bg.convert("RGB")
+
+    _shade_band(img, 60, 60 + 160, 0.35)
+
+    _shade_band(img, H - _CFG.ticker_h, H, 0.55)
+
+    patch, xy = _caption_patch(caption or "", _CFG.breaking, blink_variant % 2)
+    img.paste(patch, xy, patch)
+
+    presenter = avatar if avatar is not None else _load_presenter_avatar(_CFG.presenter_size)
     if presenter:
-        _place_presenter(img, presenter, pos)
+        _place_presenter(img, presenter, _CFG.presenter_pos)
 
-    return img.convert("RGB")
+    return img
 
 # --------------- PNG -> MP4 / concat / mux ---------------
-def _run_ffmpeg(cmd: list[str]):
+# İlerleme satırları hiçbir yerde okunmuyor; ffmpeg onları biçimlendirmesin. Hata çıktısı yine stderr'de.
+_FFMPEG_QUIET = ["-hide_banner", "-loglevel", "error"]
+
+def _run_ffmpeg(cmd: list[str], timeout: float | None = None, stdin_data: bytes | None = None):
+    if cmd and cmd[0] == "ffmpeg":
+        # stdin veri taşımıyorsa -nostdin: ffmpeg terminal etkileşimi için stdin'i yoklamasın.
+        cmd = [cmd[0], *_FFMPEG_QUIET, *([] if stdin_data is not None else ["-nostdin"]), *cmd[1:]]
     try:
-        subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=FFMPEG_TIMEOUT)
+        subprocess.run(
+            cmd, check=True, input=stdin_data,
+            stdin=None if stdin_data is not None else subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+            timeout=timeout or FFMPEG_TIMEOUT,
+        )
     except subprocess.TimeoutExpired:
         raise RuntimeError("ffmpeg timeout")
     except subprocess.CalledProcessError as e:
-        raise RuntimeError(f"ffmpeg failed: {e}")
+        tail = (e.stderr or b"").decode("utf-8", "replace").strip().splitlines()[-3:]
+        raise RuntimeError(f"ffmpeg failed: {e}" + (f" :: {' | '.join(tail)}" if tail else ""))
+
+_HW_ENCODERS = ("h264_nvenc", "h264_qsv", "h264_vaapi")
+VAAPI_DEVICE = _env("VAAPI_DEVICE", "/dev/dri/renderD128")
+
+def _hw_device_args(encoder: str) -> list[str]:
+    # VAAPI kareleri GPU yüzeyine yüklemek için bir render düğümü ister.
+    return ["-vaapi_device", VAAPI_DEVICE] if encoder == "h264_vaapi" else []
 
-def _png_to_video(png: str, duration: float, out_mp4: str, fps: int=60, zoom_per_sec: float=0.0018):
+def _hw_upload(encoder: str) -> str:
+    return ",format=nv12,hwupload" if encoder == "h264_vaapi" else ""
+
+def _encoder_works(encoder: str) -> bool:
+    # Derlenmiş olması yetmez (ör. GPU'suz nvenc); küçük bir deneme kodlaması yap.
+    cmd = [
+        "ffmpeg","-hide_banner","-v","error",
+        *_hw_device_args(encoder),
+        "-f","lavfi","-i","color=c=black:s=256x256:d=0.1",
+        *(["-vf", _hw_upload(encoder).lstrip(",")] if _hw_upload(encoder) else []),
+        "-c:v", encoder, "-f","null","-",
+    ]
+    try:
+        subprocess.run(cmd, check=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE, timeout=30)
+        return True
+    except Exception:
+        return False
+
+@lru_cache(maxsize=1)
+def _video_encoder() -> str:
+    forced = _env("VIDEO_ENCODER", "auto").lower()
+    if forced != "auto":
+        return forced
+    try:
+        listing = subprocess.run(
+            ["ffmpeg","-hide_banner","-encoders"],
+            check=True, capture_output=True, text=True, timeout=30
+        ).stdout
+    except Exception:
+        return "libx264"
+    for encoder in _HW_ENCODERS:
+        if encoder in listing and _encoder_works(encoder):
+            print(f"[ffmpeg] hardware encoder -> {encoder}")
+            return encoder
+    return "libx264"
+
+def _venc_args(still: bool=False) -> list[str]:
+    # Çıkış piksel biçimi de burada: VAAPI kareleri zaten nv12 yüzeyi olarak gelir, -pix_fmt verilmez.
+    # still=True: zoom kapalı, kareler birebir aynı; x264 hareket odaklı psy ayarlarını atlayabilir.
+    encoder = _video_encoder()
+    crf = _env("CRF","22")
+    if encoder == "h264_nvenc":
+        return ["-c:v","h264_nvenc","-preset","p4","-rc","vbr","-cq",crf,"-b:v","0","-pix_fmt","yuv420p"]
+    if encoder == "h264_qsv":
+        return ["-c:v","h264_qsv","-preset","veryfast","-global_quality",crf,"-pix_fmt","yuv420p"]
+    if encoder == "h264_vaapi":
+        return ["-c:v","h264_vaapi","-qp",crf]
+    if encoder == "libx264":
+        tune = ["-tune","stillimage"] if still else []
+        return ["-c:v","libx264","-preset",_env("X264_PRESET","veryfast"),*tune,"-crf",crf,"-pix_fmt","yuv420p"]
+    return ["-c:v", encoder, "-pix_fmt","yuv420p"]
+
+def _png_to_video(png: str, duration: float, out_mp4: str, fps: int=60, zoom_per_sec: float=0.0018, threads: int=0):
     d_frames = max(1, int(fps * max(0.5, duration)))
     zpf = max(0.0, float(zoom_per_sec)) / float(fps)
+    thread_args = ["-threads", str(threads)] if threads > 0 else []
+    # Paralel parça kodlamasında filtre grafiği de çekirdek sayısını aşmasın (global seçenekler).
+    filter_thread_args = (
+        ["-filter_threads", str(threads), "-filter_complex_threads", str(threads)] if threads > 0 else []
+    )
 
+    # PNG bir kez çözülür; kareleri zoompan/loop üretir. "-loop 1" girdisi her çıkış karesi için
+    # PNG'yi yeniden çözüyor ve zoompan her girdi karesini d kareye çoğalttığından fazla kare üretiyordu.
     filter_complex = (
-        f"scale={W}:{H},"
-        f"zoompan=z='if(lte(on,1),1.0,zoom+{zpf:.6f})':d={d_frames}:s={W}x{H},"
-        f"fps={fps}"
+        f"scale={W}:{H},format=yuv420p,"
+        f"{_still_motion(d_frames, fps, zpf)}{_hw_upload(_video_encoder())}"
     )
 
     cmd = [
         "ffmpeg","-y",
-        "-loop","1","-t",f"{max(0.5,duration):.2f}",
+        *filter_thread_args,
+        *_hw_device_args(_video_encoder()),
         "-i", png,
         "-filter_complex", filter_complex,
-        "-c:v","libx264","-preset","veryfast","-crf", _env("CRF","22"),
-        "-pix_fmt","yuv420p","-an","-movflags","+faststart",
+        *_venc_args(still=zpf <= 0),
+        # Ara parça: concat girdisi, yayınlanmıyor; faststart'ın ek yeniden yazma geçişine gerek yok.
+        "-an",
+        *thread_args,
         out_mp4
     ]
     try:
@@ -375,36 +536,233 @@ def _png_to_video(png: str, duration: float, out_mp4: str, fps: int=60, zoom_per
         print(f"[ffmpeg warn] zoompan fallback ({e})")
         cmd2 = [
             "ffmpeg","-y",
+            *filter_thread_args,
+            *_hw_device_args(_video_encoder()),
             "-loop","1","-t",f"{max(0.5,duration):.2f}",
             "-i", png,
-            "-vf", f"scale={W}:{H},format=yuv420p",
-            "-r", str(fps),
-            "-c:v","libx264","-preset","veryfast","-crf", _env("CRF","22"),
-            "-pix_fmt","yuv420p","-an","-movflags","+faststart",
+            "-vf", f"scale={W}:{H},format=yuv420p{_hw_upload(_video_encoder())}",
+            # Kare sayısı -t yuvarlamasına bırakılmaz; ana yol (zoompan d=) ile birebir aynı uzunluk.
+            "-r", str(fps), "-frames:v", str(d_frames),
+            *_venc_args(still=True),
+            "-an",
+            *thread_args,
             out_mp4
         ]
         _run_ffmpeg(cmd2)
 
-def _concat(parts: list[str], out_mp4: str):
-    with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
-        for p in parts:
-            f.write(f"file '{p}'\n")
-        lst = f.name
-    cmd = ["ffmpeg","-y","-f","concat","-safe","0","-i", lst,"-c","copy", out_mp4]
-    _run_ffmpeg(cmd)
+# Kapalı biçim: önceki kareye (zoom) ve if dalına bağlı değil; eski birikimli ifadeyle kare kare aynı çıktı.
+_ZOOMPAN_TMPL = "zoompan=z='1+{zpf:.6f}*max(on-1,0)':d={frames}:s=" + f"{W}x{H}" + ":fps={fps}"
+# Zoom kapalıysa kare hiç değişmez: zoompan her karede yeniden ölçekler, loop ise tek kareyi tekrarlar.
+_HOLD_TMPL = "loop=loop={loops}:size=1:start=0,setpts=N/{fps}/TB,fps={fps}:eof_action=pass"
+
+@lru_cache(maxsize=256)
+def _still_motion(d_frames: int, fps: int, zpf: float) -> str:
+    # Aynı süreli kareler (slayt başına arka planlar) aynı zinciri paylaşır.
+    if zpf > 0:
+        return _ZOOMPAN_TMPL.format(zpf=zpf, frames=d_frames, fps=fps)
+    return _HOLD_TMPL.format(loops=d_frames - 1, fps=fps)
+
+def _pngs_to_video(
+    stills: list[Tuple[str, float]],
+    out_mp4: str,
+    fps: int=60,
+    zoom_per_sec: float=0.0018,
+    audio_mp3: str | None = None,
+    bitrate: str = "128k",
+):
+    """
+    Tüm slayt PNG'lerini tek ffmpeg çağrısında (girdi başına zoompan + concat) kodlar.
+    audio_mp3 verilirse ses aynı çağrıda eklenir; ayrı bir gövde dosyası ve mux geçişi gerekmez.
+    """
+    zpf = max(0.0, float(zoom_per_sec)) / float(fps)
+    inputs: list[str] = []
+    chains: list[str] = []
+    for idx, (png, duration) in enumerate(stills):
+        d_frames = max(1, int(fps * max(0.5, duration)))
+        inputs += ["-i", png]
+        # Kareler zaten WxH; scale gereksiz. RGB→YUV420 dönüşümü zoompan'dan önce bir kez yapılır,
+        # böylece zoompan ve concat 4:2:0 (RGB'nin yarısı) veri üzerinde çalışır.
+        chains.append(f"[{idx}:v]format=yuv420p,{_still_motion(d_frames, fps, zpf)},setsar=1[v{idx}]")
+    labels = "".join(f"[v{idx}]" for idx in range(len(stills)))
+    filter_complex = ";".join(chains) + f";{labels}concat=n={len(stills)}:v=1:a=0{_hw_upload(_video_encoder())}[vout]"
+
+    if audio_mp3:
+        # Son çıktı: moov atomu başa alınır (faststart).
+        audio_args = [
+            "-map", f"{len(stills)}:a:0",
+            "-c:a","aac","-b:a", bitrate,
+            "-shortest","-movflags","+faststart",
+        ]
+        inputs += ["-i", audio_mp3]
+    else:
+        audio_args = ["-an"]
 
-def _mux(video_mp4: str, audio_mp3: str, out_mp4: str, bitrate="128k"):
     cmd = [
         "ffmpeg","-y",
-        "-i", video_mp4, "-i", audio_mp3,
-        "-map","0:v:0","-map","1:a:0",
-        "-c:v","libx264","-preset","veryfast","-crf", _env("CRF","22"),
-        "-pix_fmt","yuv420p",
-        "-c:a","aac","-b:a", bitrate,
-        "-shortest","-movflags","+faststart",
+        *_hw_device_args(_video_encoder()),
+        *inputs,
+        "-filter_complex", filter_complex,
+        "-map","[vout]",
+        *_venc_args(still=zpf <= 0),
+        *audio_args,
         out_mp4
     ]
-    _run_ffmpeg(cmd)
+    # Tek çağrı tüm parçaları kodladığı için zaman aşımı parça sayısıyla ölçeklenir.
+    _run_ffmpeg(cmd, timeout=FFMPEG_TIMEOUT * max(1, len(stills)))
+
+def _encode_workers(jobs: int) -> int:
+    try:
+        workers = int(_env("FFMPEG_WORKERS", str(os.cpu_count() or 1)))
+    except Exception:
+        workers = os.cpu_count() or 1
+    return max(1, min(jobs, workers))
+
+def _concat(parts: list[str], out_mp4: str, audio_mp3: Optional[str] = None, bitrate: str = "128k"):
+    # Liste stdin'den verilir; geçici .txt dosyası yazılıp silinmez. "pipe:" girdisine göre
+    # çözülmesinler diye yollar "file:" ile mutlak verilir.
+    listing = "".join(
+        "file 'file:{}'\n".format(os.path.abspath(p).replace("'", "'\\''")) for p in parts
+    )
+    if audio_mp3:
+        # Birleştirme + ses aynı çağrıda: ara gövde dosyası yazılıp ikinci ffmpeg ile okunmaz.
+        # Parçalar zaten yuv420p H.264; video kopyalanır, yalnızca ses kodlanır.
+        tail = [
+            "-i", audio_mp3,
+            "-map","0:v:0","-map","1:a:0",
+            "-c:v","copy",
+            "-c:a","aac","-b:a", bitrate,
+            "-shortest","-movflags","+faststart",
+        ]
+    else:
+        tail = ["-c","copy"]
+    cmd = [
+        "ffmpeg","-y",
+        "-f","concat","-safe","0","-protocol_whitelist","file,pipe",
+        "-i","pipe:0",
+        *tail, out_mp4,
+    ]
+    _run_ffmpeg(cmd, stdin_data=listing.encode("utf-8"))
+
+def _encode_threads(workers: int) -> int:
+    return max(1, (os.cpu_count() or 1) // workers)
+
+def _encode_part(job: Tuple[str, float, str], fps: int, zoom_per_sec: float, threads: int) -> None:
+    png, dur, part_mp4 = job
+    _png_to_video(png, dur, part_mp4, fps=fps, zoom_per_sec=zoom_per_sec, threads=threads)
+
+def _concat_parts(
+    encode_jobs: List[Tuple[str, float, str]],
+    out_mp4: str,
+    audio_mp3: Optional[str] = None,
+    bitrate: str = "128k",
+) -> None:
+    # Tüm parçalar aynı kodlayıcı ayarlarıyla üretildi; tek concat ile birleştir (ses varsa ekle).
+    parts = [part_mp4 for _, _, part_mp4 in encode_jobs]
+    try:
+        _concat(parts, out_mp4, audio_mp3=audio_mp3, bitrate=bitrate)
+    finally:
+        for part_mp4 in parts:
+            try:
+                os.remove(part_mp4)
+            except OSError:
+                pass
+
+def _encode_parts(
+    encode_jobs: List[Tuple[str, float, str]],
+    out_mp4: str,
+    fps: int,
+    zoom_per_sec: float,
+    audio_mp3: Optional[str] = None,
+    bitrate: str = "128k",
+) -> None:
+    # PNG -> MP4 kodlamaları birbirinden bağımsız; ffmpeg alt süreçleri paralel koşsun.
+    # Kodlayıcı seçimi (lru_cache ilk çağrıyı serileştirmez) havuzdan önce tek sefer yapılır.
+    _video_encoder()
+    workers = _encode_workers(len(encode_jobs))
+    threads = _encode_threads(workers)
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda job: _encode_part(job, fps, zoom_per_sec, threads), encode_jobs))
+
+    _concat_parts(encode_jobs, out_mp4, audio_mp3=audio_mp3, bitrate=bitrate)
+
+def _render_workers() -> int:
+    try:
+        return max(1, int(_env("RENDER_WORKERS", str(os.cpu_count() or 1))))
+    except Exception:
+        return os.cpu_count() or 1
+
+def _render_still(
+    downloaded: str | None,
+    caption: str,
+    theme: str,
+    variant: int,
+    out_png: str,
+    bg_blur: bool,
+    avatar: Image.Image | None,
+) -> str:
+    img = None
+    if downloaded:
+        try:
+            with Image.open(downloaded) as raw:
+                img = raw.convert("RGB")
+        except Exception:
+            img = None
+        finally:
+            try:
+                os.remove(downloaded)
+            except OSError:
+                pass
+    if img is None:
+        img = _fallback_bg(theme, variant=variant)
+
+    img = _fit_cover(img, W, H)
+    if bg_blur:
+        img = img.filter(ImageFilter.BoxBlur(1))
+    frame = _compose_caption(img, caption, theme, blink_variant=variant, avatar=avatar)
+
+    # PNG yalnızca ffmpeg girdisi + artifact; en hızlı zlib seviyesi yeterli.
+    frame.save(out_png, "PNG", compress_level=1)
+    return out_png
+
+def _render_stills(
+    captions: List[str],
+    slide_durations: List[float],
+    theme: str,
+    keywords,
+    genre: str | None,
+    bgs_per_slide: int,
+    bg_blur: bool,
+    avatar: Image.Image | None,
+    workdir: str,
+    on_ready: Callable[[Tuple[str, float, str]], None] | None = None,
+) -> List[Tuple[str, float, str]]:
+    """on_ready: her PNG yazılır yazılmaz (render iş parçacığında) ilgili kodlama işiyle çağrılır."""
+    encode_jobs: List[Tuple[str, float, str]] = []
+    renders = []
+
+    # Kare kompozisyonu (resize/paste/PNG zlib) Pillow içinde GIL'i bırakır; kareler paralel üretilir,
+    # bu sırada ana iş parçacığı bir sonraki slaytın arka planlarını indirir.
+    with ThreadPoolExecutor(max_workers=_render_workers()) as executor:
+        for i, (cap, sdur) in enumerate(zip(captions, slide_durations), start=1):
+            urls = _bg_urls_for_theme(theme, bgs_per_slide, keywords=keywords, genre=genre)
+            per_dur = max(1.5, sdur / bgs_per_slide)
+
+            downloaded = _download_many(urls)
+
+            for j, f in enumerate(downloaded, start=1):
+                out_png = (Path("out") / f"slide_{i:02d}_{j:02d}.png").as_posix()
+                job = (out_png, per_dur, os.path.join(workdir, f"slide_{i}_{j}.mp4"))
+                fut = executor.submit(_render_still, f, cap, theme, j, out_png, bg_blur, avatar)
+                if on_ready is not None:
+                    fut.add_done_callback(lambda done, job=job: done.exception() is None and on_ready(job))
+                renders.append(fut)
+                encode_jobs.append(job)
+
+        for fut in renders:
+            print(f"[slide] PNG -> {fut.result()}")
+
+    return encode_jobs
 
 # --------------- Ana ---------------
 def make_slideshow_video(
@@ -436,70 +794,58 @@ def make_slideshow_video(
     slide_durations = [max(2.5, r*scale) for r in raw]
     slide_durations[-1] = max(2.0, total - sum(slide_durations[:-1]))
 
-    fps = int(_env("FPS","60"))
-    bgs_per_slide = int(_env("BG_IMAGES_PER_SLIDE","4"))
-    bgs_per_slide = max(1, min(10, bgs_per_slide))
-    zoom_per_sec = float(_env("BG_ZOOM_PER_SEC","0.0018"))
-
-    presenter_size = int(_env("PRESENTER_SIZE","260"))
-    presenter_avatar = _load_presenter_avatar(presenter_size)
-
-    slide_mp4s = []
-
-    for i, (cap, sdur) in enumerate(zip(captions, slide_durations), start=1):
-        urls = _bg_urls_for_theme(theme, bgs_per_slide, keywords=keywords, genre=genre)
-        parts_for_slide = []
-        per_dur = max(1.5, sdur / bgs_per_slide)
-
-        downloaded = _download_many(urls)
-
-        for j, (url, f) in enumerate(zip(urls, downloaded), start=1):
-            if f:
-                try:
-                    with Image.open(f) as raw:
-                        img = raw.convert("RGB")
-                except Exception:
-                    img = _fallback_bg(theme, variant=j)
-                finally:
-                    try:
-                        os.remove(f)
-                    except OSError:
-                        pass
-            else:
-                img = _fallback_bg(theme, variant=j)
-
-            img = _fit_cover(img, W, H).filter(ImageFilter.GaussianBlur(radius=0.6))
-            frame = _compose_caption(img, cap, theme, blink_variant=j, avatar=presenter_avatar)
-
-            out_png = Path("out") / f"slide_{i:02d}_{j:02d}.png"
-            frame.save(out_png.as_posix(), "PNG", optimize=True)
-            print(f"[slide] PNG -> {out_png}")
-
-            part_mp4 = f"/tmp/slide_{i}_{j}.mp4"
-            _png_to_video(out_png.as_posix(), per_dur, part_mp4, fps=fps, zoom_per_sec=zoom_per_sec)
-            parts_for_slide.append(part_mp4)
-
-        slide_body = f"/tmp/slide_body_{i}.mp4"
-        try:
-            _concat(parts_for_slide, slide_body)
-            slide_mp4s.append(slide_body)
-        finally:
-            for part_mp4 in parts_for_slide:
-                try:
-                    os.remove(part_mp4)
-                except OSError:
-                    pass
+    # Ortam değişkenleri video başına bir kez okunur (testler/CLI env'i import sonrası değiştirebilir).
+    global _CFG
+    _CFG = _load_cfg()
+    fps = _CFG.fps
+    bgs_per_slide = _CFG.bgs_per_slide
+    zoom_per_sec = _CFG.zoom_per_sec
+    bg_blur = _CFG.bg_blur
 
-    body = "/tmp/body.mp4"
+    presenter_avatar = _load_presenter_avatar(_CFG.presenter_size)
+
+    # Ara dosyalar çağrıya özel bir dizinde; paralel çağrılar birbirinin /tmp dosyalarını ezmesin.
+    workdir = tempfile.mkdtemp(prefix="slideshow_")
     try:
-        _concat(slide_mp4s, body)
+        final_out = out_mp4
+        render_args = (captions, slide_durations, theme, keywords, genre, bgs_per_slide, bg_blur, presenter_avatar, workdir)
+
+        if not _CFG.single_pass:
+            # Parça parça kodlama: her PNG hazır olur olmaz kodlamaya girer; kompozisyon/indirme ile örtüşür.
+            # Kodlayıcı seçimi ana iş parçacığında önceden: her işçi ayrı -encoders/deneme kodlaması yapmasın.
+            _video_encoder()
+            workers = _encode_workers(len(captions) * bgs_per_slide)
+            threads = _encode_threads(workers)
+            pending = []
+            with ThreadPoolExecutor(max_workers=workers) as encoder_pool:
+                encode_jobs = _render_stills(
+                    *render_args,
+                    on_ready=lambda job: pending.append(
+                        encoder_pool.submit(_encode_part, job, fps, zoom_per_sec, threads)
+                    ),
+                )
+                for fut in pending:
+                    fut.result()
+            _concat_parts(encode_jobs, final_out, audio_mp3=audio_mp3, bitrate=_CFG.bitrate)
+            print(f"[video] DONE -> {final_out}")
+            return
+
+        encode_jobs = _render_stills(*render_args)
+        # Kodlama + ses tek ffmpeg çağrısında; ara gövde dosyası yazılıp yeniden okunmaz.
+        try:
+            _pngs_to_video(
+                [(png, dur) for png, dur, _ in encode_jobs], final_out,
+                fps=fps, zoom_per_sec=zoom_per_sec, audio_mp3=audio_mp3, bitrate=_CFG.bitrate,
+            )
+            print(f"[video] DONE -> {final_out}")
+            return
+        except Exception as e:
+            print(f"[ffmpeg warn] single-pass fallback ({e})")
+
+        _encode_parts(
+            encode_jobs, final_out, fps=fps, zoom_per_sec=zoom_per_sec,
+            audio_mp3=audio_mp3, bitrate=_CFG.bitrate,
+        )
+        print(f"[video] DONE -> {final_out}")
     finally:
-        for slide_body in slide_mp4s:
-            try:
-                os.remove(slide_body)
-            except OSError:
-                pass
-
-    final_out = out_mp4
-    _mux(body, audio_mp3, final_out, bitrate=_env("TTS_BITRATE","128k"))
-    print(f"[video] DONE -> {final_out}")
+        shutil.rmtree(workdir, ignore_errors=True)
@@ -1,12 +1,20 @@
 # -*- coding: utf-8 -*-
 from __future__ import annotations
-import os, json, mimetypes, pathlib, time, argparse
+import os, re, json, time, argparse, threading, hashlib, datetime, random, http.client
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import Optional, List, Dict, Any
+import httplib2
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaFileUpload
+from googleapiclient.http import MediaFileUpload as _GoogleMediaFileUpload
 from googleapiclient.errors import HttpError
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
+try:
+    import fcntl
+except ImportError:  # Windows: kilit yok, önbellek yine çalışır
+    fcntl = None
 
 def _env(name: str, default: Optional[str] = None) -> Optional[str]:
     v = os.getenv(name)
@@ -16,19 +24,249 @@ def _get_bool_env(name: str, default: bool=False) -> bool:
     v=_env(name)
     return default if v is None else str(v).strip().lower() in ("1","true","yes","on")
 
+_CHUNK_ALIGN = 256 * 1024
+
+def _upload_chunksize() -> int:
+    # Resumable upload parça boyutu; 256 KiB katına yuvarlanır. 0 -> tek istekte tüm dosya (-1; _chunksize_for dosya boyutuna çevirir).
+    try:
+        mb = float(_env("YT_UPLOAD_CHUNK_MB", "16"))
+    except ValueError:
+        mb = 16.0
+    if mb <= 0:
+        return -1
+    return max(_CHUNK_ALIGN, int(mb * 1024 * 1024) // _CHUNK_ALIGN * _CHUNK_ALIGN)
+
+UPLOAD_CHUNKSIZE = _upload_chunksize()
+
+def _singleshot_max_bytes() -> int:
+    # Bu boyuta kadar dosyalar parçalanmadan tek PUT ile gönderilir (oturum yine resumable).
+    try:
+        mb = float(_env("YT_SINGLESHOT_MAX_MB", "128"))
+    except ValueError:
+        mb = 128.0
+    return max(0, int(mb * 1024 * 1024))
+
+def _chunksize_for(size: int) -> int:
+    # Tek PUT için -1 yerine dosyayı kapsayan (256 KiB'e yuvarlanmış) pozitif parça: googleapiclient
+    # -1 ile kısmi ilerlemeden (308) sonra bozuk Content-Range/Length üretir, devam edemez.
+    whole = -(-size // _CHUNK_ALIGN) * _CHUNK_ALIGN
+    if UPLOAD_CHUNKSIZE == -1:
+        return whole
+    if _get_bool_env("YT_FORCE_RESUMABLE", False) or size > _singleshot_max_bytes():
+        return UPLOAD_CHUNKSIZE
+    return whole
+
+@lru_cache(maxsize=8)
+def _ensure_dir(abs_dir: str) -> None:
+    os.makedirs(abs_dir, exist_ok=True)
+
 def _dump_json(path: str, obj: Any) -> None:
-    os.makedirs("out", exist_ok=True)
-    with open(path, "w", encoding="utf-8") as f:
+    # Dizin (mutlak yol bazında) bir kez oluşturulur; çalışma dizini değişirse yeniden.
+    _ensure_dir(os.path.dirname(os.path.abspath(path)))
+    # Geçici dosyaya yaz + os.replace: yarıda kalan çalıştırma yarım JSON bırakmaz.
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
         json.dump(obj, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+# mimetypes ilk çağrıda sistemin mime veritabanını okur; yüklenen uzantılar sabit.
+_VIDEO_MIME = {".mp4": "video/mp4", ".mov": "video/quicktime", ".webm": "video/webm", ".mkv": "video/x-matroska"}
+_MAX_VIDEO_BYTES = 256 * 1024 ** 3
+_VALID_PRIVACY = frozenset({"public", "private", "unlisted"})
+_TOKEN_URI = "https://oauth2.googleapis.com/token"
+
+# scripts/gen_refresh_token.py ile aynı varsayılanlar; refresh token bu kapsamlarla üretilmeli.
+SCOPES = [
+    "https://www.googleapis.com/auth/youtube.upload",
+    "https://www.googleapis.com/auth/youtube.readonly",
+]
+
+_SCOPE_SEP_RE = re.compile(r"[\s,]+")
+
+def _configured_scopes() -> List[str]:
+    raw = _env("YT_SCOPES")
+    if not raw:
+        return list(SCOPES)
+    return [s for s in _SCOPE_SEP_RE.split(raw) if s]
+
+# Süreç içi önbellek: aynı çalıştırmada birden fazla yükleme token'ı ve istemciyi yeniden kullanır.
+_CREDS: Optional[Credentials] = None
+_YT_CLIENT: Optional[tuple[Any, Any]] = None  # (creds, youtube istemcisi)
+
+# Access token süreçler arası önbelleği. out/ artifact olarak yüklendiği için oraya yazılmaz.
+_TOKEN_MIN_TTL = 60.0
+
+def _token_cache_path() -> Optional[str]:
+    raw = _env("YT_TOKEN_CACHE", "~/.cache/otomasyon/yt_token.json")
+    if raw.strip().lower() in ("0", "off", "false", "no"):
+        return None
+    return os.path.expanduser(raw)
+
+@contextmanager
+def _token_lock(path: str):
+    """Aynı anda çalışan süreçler tek refresh yapsın diye önbellek dosyası yanında flock.
+    Dizin/kilit oluşturulamazsa (salt okunur HOME vb.) False verir; önbellek atlanır, kimlik doğrulama bozulmaz."""
+    try:
+        _ensure_dir(os.path.dirname(os.path.abspath(path)))
+        lk = open(path + ".lock", "a")
+    except OSError as e:
+        print(f"[auth] token cache unavailable ({e})")
+        yield False
+        return
+    with lk:
+        if fcntl is not None:
+            try:
+                fcntl.flock(lk, fcntl.LOCK_EX)
+            except OSError:
+                pass
+        yield True
+
+def _token_key(cid: str, rtok: str, scopes: Optional[List[str]]) -> str:
+    # Refresh token ya da kapsam değişirse eski access token kullanılmaz.
+    return hashlib.sha256("\n".join([cid, rtok, *(scopes or [])]).encode()).hexdigest()
+
+def _load_token(path: str, key: str) -> Optional[tuple[str, datetime.datetime]]:
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("key") != key:
+            return None
+        expiry = datetime.datetime.fromisoformat(data["expiry"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if (expiry - datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)).total_seconds() < _TOKEN_MIN_TTL:
+        return None
+    return data["token"], expiry
+
+def _save_token(path: str, key: str, c: Credentials) -> None:
+    if not (c.token and c.expiry):
+        return
+    tmp = path + ".tmp"
+    try:
+        fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "token": c.token, "expiry": c.expiry.isoformat()}, f)
+        os.replace(tmp, path)
+    except OSError as e:
+        print(f"[auth] token cache not written ({e})")
 
 def _creds():
+    global _CREDS
+    if _CREDS is not None and _CREDS.valid:
+        return _CREDS
     cid=_env("YT_CLIENT_ID"); csec=_env("YT_CLIENT_SECRET"); rtok=_env("YT_REFRESH_TOKEN")
     if not (cid and csec and rtok):
         raise RuntimeError("YT_CLIENT_ID/SECRET/REFRESH_TOKEN eksik.")
-    c = Credentials(None, refresh_token=rtok, client_id=cid, client_secret=csec, token_uri="https://oauth2.googleapis.com/token")
-    c.refresh(Request())
+    # Varsayılan: kapsamsız refresh (token hangi kapsamlarla verildiyse onlar gelir).
+    # YT_SCOPES açıkça verilirse refresh isteği o kapsamlarla sınırlandırılır.
+    scopes = _configured_scopes() if _env("YT_SCOPES") else None
+    c = Credentials(None, refresh_token=rtok, client_id=cid, client_secret=csec,
+                    token_uri=_TOKEN_URI, scopes=scopes)
+    cache = _token_cache_path()
+    if cache is None:
+        c.refresh(Request())
+    else:
+        key = _token_key(cid, rtok, scopes)
+        with _token_lock(cache) as usable:
+            cached = _load_token(cache, key) if usable else None
+            if cached:
+                c.token, c.expiry = cached
+            else:
+                c.refresh(Request())
+                if usable:
+                    _save_token(cache, key, c)
+    _CREDS = c
     return c
 
+_HTTP: Optional[httplib2.Http] = None
+
+def _http_timeout() -> float:
+    try:
+        return float(_env("YT_HTTP_TIMEOUT", "120"))
+    except ValueError:
+        return 120.0
+
+def _http() -> httplib2.Http:
+    # Tek Http nesnesi = host başına açık kalan TLS bağlantısı; parça PUT'ları yeni el sıkışma ödemez.
+    global _HTTP
+    if _HTTP is None:
+        _HTTP = httplib2.Http(timeout=_http_timeout())
+    return _HTTP
+
+def _youtube():
+    """Kimlik bilgisi değişmedikçe aynı istemci; keşif belgesi paketten okunur (static discovery)."""
+    global _YT_CLIENT
+    creds = _creds()
+    if _YT_CLIENT is None or _YT_CLIENT[0] is not creds:
+        http = AuthorizedHttp(creds, http=_http())
+        _YT_CLIENT = (creds, build("youtube", "v3", http=http, cache_discovery=False, static_discovery=True))
+    return _YT_CLIENT[1]
+
+def _status_client():
+    """Durum sorgusu için ayrı istemci + ayrı Http: httplib2.Http iş parçacıkları arasında paylaşılamaz,
+    aynı süreçte sonraki upload_video önbellekteki istemciyi kullanırken sorgu arka planda sürebilir."""
+    http = AuthorizedHttp(_creds(), http=httplib2.Http(timeout=_http_timeout()))
+    return build("youtube", "v3", http=http, cache_discovery=False, static_discovery=True)
+
+# Yalnızca okunan/kaydedilen alanlar; tam status+processingDetails gövdesi istenmez.
+_STATUS_FIELDS = ("items(status(uploadStatus,privacyStatus,failureReason,rejectionReason),"
+                  "processingDetails(processingStatus,processingFailureReason))")
+
+def _check_video_status(yt, video_id: str) -> Dict[str, Any]:
+    try:
+        return yt.videos().list(part="status,processingDetails", id=video_id, fields=_STATUS_FIELDS).execute() or {}
+    except Exception as e:
+        print(f"[status] check failed ({e})")
+        return {}
+
+_STATUS_FIRST_DELAY, _STATUS_MAX_DELAY = 1.0, 20.0
+
+def _status_poll_window() -> float:
+    try:
+        return float(_env("YT_STATUS_POLL_SECONDS", "120"))
+    except ValueError:
+        return 120.0
+
+def _poll_status_bg(yt, video_id: str, out_path: str) -> None:
+    """İşlenme bitene (ya da süre dolana) kadar üstel bekleme ile durum sorgular: 0, 1, 2, 4 ... 20 sn."""
+    deadline = time.monotonic() + _status_poll_window()
+    delay = 0.0
+    last_state = None
+    while True:
+        if delay:
+            if time.monotonic() + delay > deadline:
+                return
+            time.sleep(delay)
+        delay = min(max(delay * 2, _STATUS_FIRST_DELAY), _STATUS_MAX_DELAY)
+        status = _check_video_status(yt, video_id)
+        if not status:
+            continue
+        items = status.get("items") or [{}]
+        state = ((items[0].get("status") or {}).get("uploadStatus"),
+                 (items[0].get("processingDetails") or {}).get("processingStatus"))
+        # Dosyaya yalnızca durum değiştiğinde yaz; aynı yanıtı her sorguda yeniden kaydetme.
+        if state != last_state:
+            _dump_json(out_path, status)
+            last_state = state
+        if state[0] in ("processed", "failed", "rejected", "deleted"):
+            return
+
+_STATUS_THREAD: Optional[threading.Thread] = None
+
+def wait_status_poll() -> None:
+    """Arka plandaki durum sorgusunu en fazla YT_STATUS_POLL_SECONDS bekler (varsa)."""
+    if _STATUS_THREAD is not None:
+        _STATUS_THREAD.join(timeout=_status_poll_window())
+
+def _dump_channel_debug(yt) -> None:
+    # YT_DEBUG: hangi kanala yüklendiğini doğrulamak için kanal özetini kaydet.
+    try:
+        # Kimlik doğrulama için kanal id + başlık yeterli; tam snippet gövdesi istenmez.
+        me = yt.channels().list(part="snippet", mine=True, fields="items(id,snippet/title)").execute()
+        _dump_json("out/youtube_me.json", me or {})
+    except Exception as e:
+        print(f"[debug] channel lookup failed ({e})")
+
 def _add_to_playlist(yt, video_id: str, playlist_id: str) -> None:
     if not playlist_id: return
     try:
@@ -40,41 +278,159 @@ def _add_to_playlist(yt, video_id: str, playlist_id: str) -> None:
     except Exception as e:
         _dump_json("out/playlist_error.json", {"error": str(e), "playlistId": playlist_id, "videoId": video_id})
 
+def _upload_limits() -> tuple[float, float]:
+    try:
+        idle = float(_env("YT_UPLOAD_MAX_IDLE_SECONDS", "300"))
+    except ValueError:
+        idle = 300.0
+    try:
+        total = float(_env("YT_UPLOAD_MAX_TOTAL_SECONDS", "1800"))
+    except ValueError:
+        total = 1800.0
+    return idle, total
+
+_RETRY_STATUS = frozenset({429, 500, 502, 503, 504})
+
+def _upload_retries() -> int:
+    try:
+        return max(0, int(_env("YT_UPLOAD_RETRIES", "5")))
+    except ValueError:
+        return 5
+
+def _next_chunk(req, retries: int):
+    """Geçici hatada (429/5xx, bağlantı/TLS) üstel bekleyip aynı parçayı yeniden dener.
+    googleapiclient hatadan sonraki çağrıda sunucudaki ofseti sorgulayıp oradan devam eder.
+    (status, response, süre) döner; süre yalnızca başarılı denemeyi kapsar (bekleme/başarısız deneme hariç)."""
+    for attempt in range(retries + 1):
+        delay = min(2 ** attempt + random.random(), 60.0)
+        t0 = time.monotonic()
+        try:
+            status, resp = req.next_chunk()
+            return status, resp, time.monotonic() - t0
+        except HttpError as e:
+            if attempt >= retries or getattr(e.resp, "status", None) not in _RETRY_STATUS:
+                raise
+            err: Exception = e
+            # 429/503 ile gelen Retry-After (saniye) varsa ondan erken deneme.
+            try:
+                delay = min(max(delay, float(e.resp.get("retry-after", 0))), 60.0)
+            except (TypeError, ValueError, AttributeError):
+                pass
+        except (OSError, http.client.HTTPException, httplib2.HttpLib2Error) as e:
+            if attempt >= retries:
+                raise
+            err = e
+        print(f"[upload] retry {attempt + 1}/{retries} in {delay:.1f}s ({err})")
+        time.sleep(delay)
+
+class MediaFileUpload(_GoogleMediaFileUpload):
+    """Parça boyutu yükleme sırasında değiştirilebilen MediaFileUpload.
+    googleapiclient her next_chunk'ta chunksize()'ı yeniden okur; bir sonraki parça yeni boyutla gider."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._next_chunksize = super().chunksize()
+
+    def chunksize(self) -> int:
+        return self._next_chunksize
+
+    def set_chunksize(self, size: int) -> None:
+        self._next_chunksize = size
+
+_CHUNK_MIN, _CHUNK_MAX = 1024 * 1024, 100 * 1024 * 1024
+
+def _chunk_target_seconds() -> float:
+    try:
+        return max(0.0, float(_env("YT_CHUNK_TARGET_SECONDS", "5")))
+    except ValueError:
+        return 5.0
+
+def _adapt_chunksize(media, nbytes: int, seconds: float, target: float) -> None:
+    """Son parçanın hızına göre bir sonraki parçayı ~target saniyelik PUT olacak şekilde boyutlandırır."""
+    if nbytes <= 0 or seconds <= 0:
+        return
+    want = int(nbytes / seconds * target) // _CHUNK_ALIGN * _CHUNK_ALIGN
+    size = min(_CHUNK_MAX, max(_CHUNK_MIN, want))
+    current = media.chunksize()
+    if size != current:
+        if _get_bool_env("YT_DEBUG", False):
+            print(f"[upload] chunk size {current >> 10} KiB -> {size >> 10} KiB")
+        media.set_chunksize(size)
+
+def _run_resumable(req) -> Dict[str, Any]:
+    """next_chunk döngüsü; ilerleme yoksa (idle) ya da toplam süre aşılırsa hata verir."""
+    max_idle, max_total = _upload_limits()
+    retries = _upload_retries()
+    # Parçalı yüklemede parça boyutu ölçülen hıza uyarlanır (tek PUT'ta parça dosyayı kapsar, dokunulmaz).
+    media = getattr(req, "resumable", None)
+    adaptive = hasattr(media, "set_chunksize") and 0 < media.chunksize() < media.size()
+    target = _chunk_target_seconds() if adaptive else 0.0
+    resp=None; last=-1; sent=-1; sent_bytes=0
+    start = last_progress = last_print = time.monotonic()
+    while resp is None:
+        status, resp, took = _next_chunk(req, retries)
+        now = time.monotonic()
+        if status is not None:
+            # Birincil sinyal gönderilen bayt: büyük dosyalarda yüzde, parçalar arasında
+            # ilerlemese de bayt sayısı artar. Bayt yoksa oran karşılaştırılır.
+            try:
+                frac = float(status.progress())
+            except Exception:
+                frac = None
+            done = getattr(status, "resumable_progress", None)
+            if target and done is not None:
+                _adapt_chunksize(media, done - sent_bytes, took, target)
+                sent_bytes = done
+            mark = done if done is not None else frac
+            if mark is None or mark > sent:
+                sent = mark if mark is not None else sent
+                last_progress = now
+            if frac is not None:
+                # CI log borusunu her parçada yazmamak için en az %5 ya da 2 sn arayla.
+                pct = int(frac*100)
+                if pct - last >= 5 or (pct != last and now - last_print >= 2.0):
+                    print(f"[upload] {pct}%"); last=pct; last_print=now
+        if resp is not None:
+            break
+        if now - last_progress > max_idle:
+            raise RuntimeError(f"Upload stalled: no progress for {int(now - last_progress)}s")
+        if now - start > max_total:
+            raise RuntimeError(f"Upload timed out ({int(max_total)}s)")
+    return resp or {}
+
 def upload_video(video_path: str, title: str, description: str,
                  privacy_status: str="public", category_id: str="22",
                  tags: Optional[List[str]]=None) -> str:
-    p = pathlib.Path(video_path)
-    if not p.exists() or p.stat().st_size <= 0:
+    try:
+        size = os.stat(video_path).st_size
+    except OSError:
+        size = 0
+    if size <= 0:
         raise RuntimeError(f"Video yok/boş: {video_path}")
+    if size > _MAX_VIDEO_BYTES:
+        raise RuntimeError(f"Video YouTube sınırını (256 GB) aşıyor: {video_path}")
 
-    yt = build("youtube", "v3", credentials=_creds(), cache_discovery=False)
+    yt = _youtube()
+    if _get_bool_env("YT_DEBUG", False):
+        _dump_channel_debug(yt)
 
     body = {
         "snippet": {"title": (title or "")[:95],
                     "description": (description or "")[:4900],
                     "categoryId": category_id},
-        "status": {"privacyStatus": privacy_status if privacy_status in {"public","private","unlisted"} else "unlisted",
+        "status": {"privacyStatus": privacy_status if privacy_status in _VALID_PRIVACY else "unlisted",
                    "selfDeclaredMadeForKids": _get_bool_env("YT_MADE_FOR_KIDS", False)}
     }
     if tags: body["snippet"]["tags"] = tags[:500]
 
-    mime,_ = mimetypes.guess_type(str(p))
-    media = MediaFileUpload(str(p), mimetype=mime or "video/mp4", chunksize=1024*1024, resumable=True)
+    mime = _VIDEO_MIME.get(os.path.splitext(video_path)[1].lower(), "video/mp4")
+    media = MediaFileUpload(video_path, mimetype=mime, chunksize=_chunksize_for(size), resumable=True)
     req = yt.videos().insert(part="snippet,status", body=body, media_body=media)
 
-    resp=None; last=-1; start=time.monotonic()
-    while resp is None:
-        status, resp = req.next_chunk()
-        if status and hasattr(status,"progress"):
-            try:
-                pct = int(float(status.progress())*100)
-                if pct != last:
-                    print(f"[upload] {pct}%"); last=pct
-            except: pass
-        if time.monotonic()-start > 1800: raise RuntimeError("Upload timed out (1800s)")
-    _dump_json("out/youtube_response.json", resp or {})
-
-    vid = (resp or {}).get("id")
+    resp = _run_resumable(req)
+    _dump_json("out/youtube_response.json", resp)
+
+    vid = resp.get("id")
     if not vid: raise RuntimeError("Video id dönmedi")
     print("[done]", f"https://youtu.be/{vid}")
 
@@ -82,17 +438,56 @@ def upload_video(video_path: str, title: str, description: str,
     if pl:
         _add_to_playlist(yt, vid, pl)
 
+    if _get_bool_env("YT_STATUS_POLL", True):
+        # İşlenme durumu yalnızca bilgi amaçlı; yükleyiciyi bekletmeden arka planda sorgula.
+        # Kendi istemcisi/bağlantısı var; önbellekteki yükleme istemcisiyle eşzamanlı kullanılmaz.
+        # daemon: süreç çıkışını bekletmez. Dosyanın yazılması isteniyorsa CLI YT_STATUS_WAIT=1 ile bekler.
+        global _STATUS_THREAD
+        _STATUS_THREAD = threading.Thread(
+            target=_poll_status_bg, args=(_status_client(), vid, os.path.abspath("out/youtube_status.json")),
+            name="yt-status-poll", daemon=True,
+        )
+        _STATUS_THREAD.start()
+
     return f"https://youtu.be/{vid}"
 
-# CLI optional (local testing)
+def try_upload_youtube(video_path: str, title: str, description: str,
+                       privacy_status: str="public", category_id: str="22",
+                       tags: Optional[List[str]]=None) -> Optional[str]:
+    """upload_video gibi; hata fırlatmak yerine out/youtube_error.json yazar ve None döner."""
+    try:
+        return upload_video(video_path, title, description,
+                            privacy_status=privacy_status, category_id=category_id, tags=tags)
+    except HttpError as e:
+        _dump_json("out/youtube_error.json", {"error": str(e), "status": getattr(e.resp, "status", None)})
+    except Exception as e:
+        _dump_json("out/youtube_error.json", {"error": str(e)})
+    print("[upload] failed; see out/youtube_error.json")
+    return None
+
+def check_auth() -> None:
+    """Refresh token'ı doğrular (CI'da yüklemeden önce hızlı kontrol)."""
+    _creds()
+    print("Refresh OK")
+
+# CLI: workflow ve yerel testler bu modülü kullanır (python -m src.youtube_upload ...)
 if __name__ == "__main__":
     ap = argparse.ArgumentParser()
-    ap.add_argument("--video", required=True)
-    ap.add_argument("--title", required=True)
+    ap.add_argument("--check-auth", action="store_true", help="sadece refresh token'ı doğrula")
+    ap.add_argument("--video")
+    ap.add_argument("--title")
     ap.add_argument("--desc", default="")
-    ap.add_argument("--privacy", default="public", choices=["public","unlisted","private"])
+    ap.add_argument("--privacy", default="public", choices=sorted(_VALID_PRIVACY))
     ap.add_argument("--tags", default="")
     args = ap.parse_args()
 
-    tags = [t.strip() for t in (args.tags or "").split(",") if t.strip()]
-    upload_video(args.video, args.title, args.desc, privacy_status=args.privacy, tags=tags)
+    if args.check_auth:
+        check_auth()
+    else:
+        if not (args.video and args.title):
+            ap.error("--video ve --title gerekli")
+        tags = [t.strip() for t in (args.tags or "").split(",") if t.strip()]
+        upload_video(args.video, args.title, args.desc, privacy_status=args.privacy, tags=tags)
+        # Varsayılan: çıkışta beklenmez (CI adımı uzamaz); YT_STATUS_WAIT=1 youtube_status.json için bekler.
+        if _get_bool_env("YT_STATUS_WAIT", False):
+            wait_status_poll()
@@ -20,6 +20,7 @@ def test_make_slideshow_video_uses_downloads_and_ffmpeg(monkeypatch, tmp_path):
     monkeypatch.setenv("BG_IMAGES_PER_SLIDE", "1")
     monkeypatch.setenv("FPS", "24")
     monkeypatch.setenv("TTS_BITRATE", "96k")
+    monkeypatch.setenv("SINGLE_PASS_ENCODE", "0")
 
     def fake_ffprobe(path):
         assert path == audio_mp3.as_posix()
@@ -49,7 +50,7 @@ def test_make_slideshow_video_uses_downloads_and_ffmpeg(monkeypatch, tmp_path):
 
     png_calls = []
 
-    def fake_png_to_video(png, duration, out_mp4_path, fps, zoom_per_sec):
+    def fake_png_to_video(png, duration, out_mp4_path, fps, zoom_per_sec, threads=0):
         png_calls.append((png, duration, out_mp4_path, fps, zoom_per_sec))
         Path(out_mp4_path).write_text("video")
 
@@ -57,20 +58,12 @@ def test_make_slideshow_video_uses_downloads_and_ffmpeg(monkeypatch, tmp_path):
 
     concat_calls = []
 
-    def fake_concat(parts, out_mp4_path):
-        concat_calls.append((list(parts), out_mp4_path))
-        Path(out_mp4_path).write_text("concat")
+    def fake_concat(parts, out_mp4_path, audio_mp3=None, bitrate="128k"):
+        concat_calls.append((list(parts), out_mp4_path, audio_mp3, bitrate))
+        Path(out_mp4_path).write_text("muxed")
 
     monkeypatch.setattr(video, "_concat", fake_concat)
 
-    mux_calls = []
-
-    def fake_mux(video_mp4, audio_mp3_arg, final_out, bitrate):
-        mux_calls.append((video_mp4, audio_mp3_arg, final_out, bitrate))
-        Path(final_out).write_text("muxed")
-
-    monkeypatch.setattr(video, "_mux", fake_mux)
-
     captions = ["Breaking update"]
 
     video.make_slideshow_video(
@@ -88,12 +81,64 @@ def test_make_slideshow_video_uses_downloads_and_ffmpeg(monkeypatch, tmp_path):
     assert pytest.approx(first_png_call[1], rel=1e-3) == 9.0
     assert first_png_call[3] == 24
 
-    assert len(concat_calls) == 2
-    assert mux_calls == [
-        (concat_calls[-1][1], audio_mp3.as_posix(), out_mp4.as_posix(), "96k")
+    # Concatenation and audio mux happen in one ffmpeg call straight into the output.
+    assert concat_calls == [
+        ([call[2] for call in png_calls], out_mp4.as_posix(), audio_mp3.as_posix(), "96k")
     ]
     assert out_mp4.exists()
     assert out_mp4.read_text() == "muxed"
 
     generated_pngs = list((tmp_path / "out").glob("*.png"))
     assert generated_pngs, "Expected rendered slide images"
+
+
+def test_make_slideshow_video_single_pass_encodes_all_stills(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    audio_mp3 = tmp_path / "audio.mp3"
+    audio_mp3.write_bytes(b"fake audio")
+    out_mp4 = tmp_path / "result.mp4"
+
+    monkeypatch.setenv("BG_IMAGES_PER_SLIDE", "2")
+    monkeypatch.setenv("FPS", "24")
+    monkeypatch.delenv("SINGLE_PASS_ENCODE", raising=False)
+
+    monkeypatch.setattr(video, "_ffprobe_duration", lambda path: 12.0)
+    monkeypatch.setattr(video, "_download_many", lambda urls: [None for _ in urls])
+
+    def fail_png_to_video(*args, **kwargs):
+        raise AssertionError("per-part encode should not run in single-pass mode")
+
+    monkeypatch.setattr(video, "_png_to_video", fail_png_to_video)
+
+    single_pass_calls = []
+
+    def fake_pngs_to_video(stills, out_path, fps, zoom_per_sec, audio_mp3=None, bitrate="128k"):
+        single_pass_calls.append((list(stills), out_path, fps, audio_mp3))
+        Path(out_path).write_text("encoded")
+
+    monkeypatch.setattr(video, "_pngs_to_video", fake_pngs_to_video)
+
+    concat_calls = []
+
+    def fake_concat(parts, out_mp4_path, audio_mp3=None, bitrate="128k"):
+        concat_calls.append(out_mp4_path)
+        Path(out_mp4_path).write_text("muxed")
+
+    monkeypatch.setattr(video, "_concat", fake_concat)
+
+    video.make_slideshow_video(
+        images=[],
+        captions=["First", "Second"],
+        audio_mp3=audio_mp3.as_posix(),
+        out_mp4=out_mp4.as_posix(),
+    )
+
+    assert len(single_pass_calls) == 1
+    stills, out_path, fps, audio_arg = single_pass_calls[0]
+    assert len(stills) == 4
+    assert all(Path(png).suffix == ".png" for png, _ in stills)
+    assert fps == 24
+    assert out_path == out_mp4.as_posix()
+    assert audio_arg == audio_mp3.as_posix()
+    assert concat_calls == []
+    assert out_mp4.read_text() == "encoded"
@@ -1,6 +1,13 @@
+import datetime
 import importlib
 import json
 
+import httplib2
+import pytest
+from googleapiclient.discovery import build as real_build
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpMockSequence
+
 import youtube_upload
 
 
@@ -160,3 +167,380 @@ def test_try_upload_youtube_returns_url_on_success(monkeypatch, tmp_path):
 
     assert url == "https://youtu.be/abc123"
 
+
+
+def test_run_resumable_counts_bytes_as_progress(monkeypatch):
+    monkeypatch.setenv("YT_UPLOAD_MAX_IDLE_SECONDS", "5")
+    monkeypatch.setenv("YT_UPLOAD_MAX_TOTAL_SECONDS", "100")
+
+    now = [0.0]
+    monkeypatch.setattr(youtube_upload.time, "monotonic", lambda: now[0])
+
+    class FakeStatus:
+        def __init__(self, bytes_progress):
+            self.resumable_progress = bytes_progress
+
+        def progress(self):
+            # Large file: the fraction barely moves between chunks.
+            return 0.5
+
+    class FakeRequest:
+        def __init__(self):
+            self.calls = 0
+
+        def next_chunk(self):
+            self.calls += 1
+            now[0] += 3
+            if self.calls < 6:
+                return FakeStatus(self.calls * 1_000), None
+            return None, {"id": "xyz"}
+
+    assert youtube_upload._run_resumable(FakeRequest()) == {"id": "xyz"}
+
+
+def test_run_resumable_retries_transient_server_errors(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(youtube_upload.time, "sleep", sleeps.append)
+
+    class FakeRequest:
+        def __init__(self):
+            self.calls = 0
+
+        def next_chunk(self):
+            self.calls += 1
+            if self.calls == 1:
+                raise HttpError(httplib2.Response({"status": 503}), b"")
+            return None, {"id": "retry-ok"}
+
+    request = FakeRequest()
+    assert youtube_upload._run_resumable(request) == {"id": "retry-ok"}
+    assert request.calls == 2
+    assert len(sleeps) == 1
+
+
+def test_run_resumable_does_not_retry_client_errors(monkeypatch):
+    monkeypatch.setattr(youtube_upload.time, "sleep", lambda s: None)
+
+    class FakeRequest:
+        def next_chunk(self):
+            raise HttpError(httplib2.Response({"status": 403}), b"")
+
+    with pytest.raises(HttpError):
+        youtube_upload._run_resumable(FakeRequest())
+
+
+def test_run_resumable_honours_retry_after(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(youtube_upload.time, "sleep", sleeps.append)
+
+    class FakeRequest:
+        def __init__(self):
+            self.calls = 0
+
+        def next_chunk(self):
+            self.calls += 1
+            if self.calls == 1:
+                raise HttpError(httplib2.Response({"status": 429, "retry-after": "7"}), b"")
+            return None, {"id": "later"}
+
+    assert youtube_upload._run_resumable(FakeRequest()) == {"id": "later"}
+    assert sleeps == [7.0]
+
+
+def _adaptive_media(tmp_path, chunksize):
+    video_path = tmp_path / "video.mp4"
+    with open(video_path, "wb") as f:
+        # Sparse file larger than the chunk so the upload counts as chunked.
+        f.truncate(4 * chunksize)
+    return youtube_upload.MediaFileUpload(
+        video_path.as_posix(), mimetype="video/mp4", chunksize=chunksize, resumable=True
+    )
+
+
+def test_run_resumable_adapts_chunk_size_to_measured_speed(monkeypatch, tmp_path):
+    monkeypatch.setenv("YT_CHUNK_TARGET_SECONDS", "5")
+
+    now = [0.0]
+    monkeypatch.setattr(youtube_upload.time, "monotonic", lambda: now[0])
+
+    mib = 1024 * 1024
+
+    class FakeStatus:
+        def __init__(self, bytes_progress):
+            self.resumable_progress = bytes_progress
+
+        def progress(self):
+            return 0.5
+
+    class FakeRequest:
+        resumable = _adaptive_media(tmp_path, 16 * mib)
+
+        def __init__(self):
+            self.calls = 0
+
+        def next_chunk(self):
+            self.calls += 1
+            if self.calls == 1:
+                # 16 MiB in 8 s -> 2 MiB/s -> 10 MiB for a 5 s PUT.
+                now[0] += 8
+                return FakeStatus(16 * mib), None
+            return None, {"id": "adaptive"}
+
+    request = FakeRequest()
+    assert youtube_upload._run_resumable(request) == {"id": "adaptive"}
+    assert request.resumable.chunksize() == 10 * mib
+
+
+def test_run_resumable_chunk_timing_excludes_retry_backoff(monkeypatch, tmp_path):
+    monkeypatch.setenv("YT_CHUNK_TARGET_SECONDS", "5")
+
+    now = [0.0]
+    monkeypatch.setattr(youtube_upload.time, "monotonic", lambda: now[0])
+
+    def fake_sleep(seconds):
+        now[0] += seconds
+
+    monkeypatch.setattr(youtube_upload.time, "sleep", fake_sleep)
+
+    mib = 1024 * 1024
+
+    class FakeStatus:
+        resumable_progress = 16 * mib
+
+        def progress(self):
+            return 0.5
+
+    class FakeRequest:
+        resumable = _adaptive_media(tmp_path, 16 * mib)
+
+        def __init__(self):
+            self.calls = 0
+
+        def next_chunk(self):
+            self.calls += 1
+            if self.calls == 1:
+                now[0] += 2
+                raise HttpError(httplib2.Response({"status": 503, "retry-after": "30"}), b"")
+            if self.calls == 2:
+                now[0] += 8
+                return FakeStatus(), None
+            return None, {"id": "retried"}
+
+    request = FakeRequest()
+    assert youtube_upload._run_resumable(request) == {"id": "retried"}
+    # Only the successful 8 s attempt counts; the failed attempt and 30 s wait do not.
+    assert request.resumable.chunksize() == 10 * mib
+
+
+def test_poll_status_bg_writes_on_change_and_stops_when_processed(monkeypatch, tmp_path):
+    monkeypatch.setenv("YT_STATUS_POLL_SECONDS", "120")
+    sleeps = []
+    monkeypatch.setattr(youtube_upload.time, "sleep", sleeps.append)
+
+    def status(upload_status):
+        return {"items": [{"status": {"uploadStatus": upload_status},
+                           "processingDetails": {"processingStatus": "processing"}}]}
+
+    responses = [status("uploaded"), status("uploaded"), {}, status("processed"), status("processed")]
+    calls = []
+
+    def fake_check(yt, vid):
+        calls.append(vid)
+        return responses[len(calls) - 1]
+
+    monkeypatch.setattr(youtube_upload, "_check_video_status", fake_check)
+
+    writes = []
+    real_dump = youtube_upload._dump_json
+
+    def recording_dump(path, obj):
+        writes.append(obj)
+        real_dump(path, obj)
+
+    monkeypatch.setattr(youtube_upload, "_dump_json", recording_dump)
+
+    out_path = tmp_path / "out" / "youtube_status.json"
+    youtube_upload._poll_status_bg(object(), "vid1", out_path.as_posix())
+
+    # Stops on the first "processed" poll; the repeated "uploaded" is not rewritten.
+    assert len(calls) == 4
+    assert writes == [status("uploaded"), status("processed")]
+    assert sleeps == [1.0, 2.0, 4.0]
+    assert json.loads(out_path.read_text(encoding="utf-8")) == status("processed")
+
+
+@pytest.fixture
+def token_env(monkeypatch, tmp_path):
+    monkeypatch.setenv("YT_CLIENT_ID", "cid")
+    monkeypatch.setenv("YT_CLIENT_SECRET", "secret")
+    monkeypatch.setenv("YT_REFRESH_TOKEN", "refresh")
+    monkeypatch.delenv("YT_SCOPES", raising=False)
+    cache = tmp_path / "cache" / "yt_token.json"
+    monkeypatch.setenv("YT_TOKEN_CACHE", cache.as_posix())
+    monkeypatch.setattr(youtube_upload, "_CREDS", None)
+
+    refreshes = []
+
+    def fake_refresh(self, request):
+        refreshes.append(self.refresh_token)
+        self.token = f"token-{len(refreshes)}"
+        self.expiry = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(hours=1)
+
+    monkeypatch.setattr(youtube_upload.Credentials, "refresh", fake_refresh)
+    return cache, refreshes
+
+
+def _fresh_creds(monkeypatch):
+    monkeypatch.setattr(youtube_upload, "_CREDS", None)
+    return youtube_upload._creds()
+
+
+def test_creds_reuses_cached_token_across_runs(monkeypatch, token_env):
+    cache, refreshes = token_env
+    first = _fresh_creds(monkeypatch)
+    second = _fresh_creds(monkeypatch)
+
+    assert refreshes == ["refresh"]
+    assert second.token == first.token == "token-1"
+    assert cache.exists()
+
+
+def test_creds_ignores_cache_for_other_refresh_token(monkeypatch, token_env):
+    cache, refreshes = token_env
+    _fresh_creds(monkeypatch)
+    monkeypatch.setenv("YT_REFRESH_TOKEN", "rotated")
+    creds = _fresh_creds(monkeypatch)
+
+    assert refreshes == ["refresh", "rotated"]
+    assert creds.token == "token-2"
+
+
+def test_creds_refreshes_token_close_to_expiry(monkeypatch, token_env):
+    cache, refreshes = token_env
+    _fresh_creds(monkeypatch)
+    data = json.loads(cache.read_text(encoding="utf-8"))
+    soon = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None) + datetime.timedelta(seconds=youtube_upload._TOKEN_MIN_TTL / 2)
+    data["expiry"] = soon.isoformat()
+    cache.write_text(json.dumps(data), encoding="utf-8")
+
+    creds = _fresh_creds(monkeypatch)
+    assert len(refreshes) == 2
+    assert creds.token == "token-2"
+
+
+def test_creds_falls_back_to_refresh_when_cache_unwritable(monkeypatch, token_env, tmp_path):
+    _, refreshes = token_env
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("file")
+    monkeypatch.setenv("YT_TOKEN_CACHE", (blocker / "yt_token.json").as_posix())
+
+    creds = _fresh_creds(monkeypatch)
+    assert refreshes == ["refresh"]
+    assert creds.token == "token-1"
+
+
+def test_chunksize_for_single_put_threshold_and_force(monkeypatch):
+    mib = 1024 * 1024
+    align = youtube_upload._CHUNK_ALIGN
+    monkeypatch.setattr(youtube_upload, "UPLOAD_CHUNKSIZE", 16 * mib)
+    monkeypatch.setenv("YT_SINGLESHOT_MAX_MB", "20")
+    monkeypatch.delenv("YT_FORCE_RESUMABLE", raising=False)
+
+    # At or below the threshold: one positive chunk covering the whole file (never -1).
+    assert youtube_upload._chunksize_for(10_000) == align
+    assert youtube_upload._chunksize_for(20 * mib) == 20 * mib
+    assert youtube_upload._chunksize_for(align + 1) == 2 * align
+    # Above the threshold: configured chunks.
+    assert youtube_upload._chunksize_for(20 * mib + 1) == 16 * mib
+
+    monkeypatch.setenv("YT_FORCE_RESUMABLE", "1")
+    assert youtube_upload._chunksize_for(10_000) == 16 * mib
+
+    # YT_UPLOAD_CHUNK_MB=0 (whole file) also maps to a covering positive chunk.
+    monkeypatch.setattr(youtube_upload, "UPLOAD_CHUNKSIZE", -1)
+    assert youtube_upload._chunksize_for(30 * mib + 5) == 30 * mib + align
+
+
+def test_single_put_upload_resumes_after_partial_308(monkeypatch, tmp_path):
+    monkeypatch.setattr(youtube_upload.time, "sleep", lambda s: None)
+    monkeypatch.delenv("YT_FORCE_RESUMABLE", raising=False)
+    monkeypatch.delenv("YT_SINGLESHOT_MAX_MB", raising=False)
+
+    video_path = tmp_path / "video.mp4"
+    video_path.write_bytes(b"x" * 10_000)
+
+    class RecordingHttp(HttpMockSequence):
+        def __init__(self, iterable):
+            super().__init__(iterable)
+            self.puts = []
+
+        def request(self, uri, method="GET", body=None, headers=None, *args, **kwargs):
+            if method == "PUT":
+                data = body.read() if hasattr(body, "read") else body
+                self.puts.append((dict(headers or {}), data))
+            return super().request(uri, method, body, headers, *args, **kwargs)
+
+    http = RecordingHttp([
+        ({"status": "200", "location": "https://upload.example/session"}, ""),
+        # The server only committed part of the single PUT.
+        ({"status": "308", "range": "bytes=0-5999"}, ""),
+        ({"status": "200"}, '{"id": "resumed"}'),
+    ])
+    yt = real_build("youtube", "v3", http=http, static_discovery=True, developerKey="k")
+
+    size = video_path.stat().st_size
+    media = youtube_upload.MediaFileUpload(
+        video_path.as_posix(), mimetype="video/mp4",
+        chunksize=youtube_upload._chunksize_for(size), resumable=True,
+    )
+    req = yt.videos().insert(part="snippet,status", body={"snippet": {"title": "t"}}, media_body=media)
+
+    assert youtube_upload._run_resumable(req) == {"id": "resumed"}
+
+    (first_headers, first_body), (second_headers, second_body) = http.puts
+    assert first_headers["Content-Range"] == "bytes 0-9999/10000"
+    assert len(first_body) == 10_000
+    assert second_headers["Content-Range"] == "bytes 6000-9999/10000"
+    assert second_headers["Content-Length"] == "4000"
+    assert len(second_body) == 4000
+
+
+def test_status_poll_uses_its_own_client(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    video_path = tmp_path / "video.mp4"
+    video_path.write_bytes(b"video")
+
+    monkeypatch.setattr(youtube_upload, "_creds", lambda: object())
+    monkeypatch.setattr(youtube_upload, "_YT_CLIENT", None)
+    monkeypatch.setattr(youtube_upload, "MediaFileUpload", lambda *args, **kwargs: None)
+
+    class FakeRequest:
+        def next_chunk(self):
+            return None, {"id": "own-client"}
+
+    class FakeVideos:
+        def insert(self, **kwargs):
+            return FakeRequest()
+
+    built = []
+
+    class FakeYoutube:
+        def videos(self):
+            return FakeVideos()
+
+    def fake_build(*args, **kwargs):
+        built.append((FakeYoutube(), kwargs["http"]))
+        return built[-1][0]
+
+    monkeypatch.setattr(youtube_upload, "build", fake_build)
+
+    polled = []
+    monkeypatch.setattr(youtube_upload, "_poll_status_bg", lambda yt, vid, path: polled.append(yt))
+
+    youtube_upload.upload_video(video_path.as_posix(), "Title", "Desc")
+    youtube_upload.wait_status_poll()
+
+    (upload_yt, upload_http), (poll_yt, poll_http) = built
+    assert polled == [poll_yt]
+    assert poll_yt is not upload_yt
+    assert poll_http.http is not upload_http.http